@@ -1,24 +1,41 @@
 # Licensed under Functional Source License (FSL) FSL-1.1-MIT
 # See README.md, LICENSE in the project root for license information.
 
+import asyncio
 import os
 import re
-from collections.abc import AsyncIterator
+import time
+from collections.abc import AsyncIterator, Callable
+from functools import lru_cache, partial
+from html.parser import HTMLParser
 from contextlib import asynccontextmanager
 from dataclasses import dataclass
 from typing import Any, Annotated, Optional, Literal
 from pathlib import Path
 
 from pydantic import Field
-from markdownify import markdownify as md
 
 from fastmcp import FastMCP, Context
 from mcp.types import ImageContent
 
 import saspy
 
+# the attribute gaps are bounded so a non-matching tag never rescans its base64 payload.
+# alt text stops at its closing quote, so it needs no bound (ODS DESCRIPTION= can be long).
+_RE_IMG = re.compile(r'<img\b[^>]{0,512}?\balt="(?P<alt>[^"]*)"[^>]{0,512}?'
+                     r'\bsrc="data:(?P<mime>[^;"]{1,64});base64,(?P<b64>[^"]+)"')
+# characters escaped in text outside <pre>, so that e.g. _FREQ_ is not rendered as emphasis
+_MD_ESCAPES = str.maketrans({"\\": "\\\\", "_": "\\_", "*": "\\*"})
+_RE_TRAILING_SPACES = re.compile(r"[ \t]+\n")
+_RE_BLANK_LINES = re.compile(r"\n{3,}")
+
+# seconds to keep librefs, table lists and column info before asking SAS again
+_META_CACHE_TTL = 60.0
+# seconds between progress notifications while SAS code is running
+_PROGRESS_INTERVAL = 5.0
+
 class SASSessionManager:
-    """Wrapper around saspy.SASsession providing restart/end methods."""
+    """Wrapper around saspy.SASsession providing restart/end methods and a metadata cache."""
     def __init__(self, **kwargs: Any):
         """
         Initialize SAS session with optional kwargs.
@@ -32,14 +49,28 @@ class SASSessionManager:
             self._kwargs['cfgname'] = os.environ['SAS_CFGNAME']
 
         self.session: Optional[saspy.SASsession] = None
+        self._meta_cache: dict[tuple, tuple[float, Any]] = {}
         self._create()
 
     def _create(self) -> None:
         self.session = saspy.SASsession(**self._kwargs)
 
+    def cached(self, key: tuple, fn: Callable[[], Any], ttl: float = _META_CACHE_TTL) -> Any:
+        """Return the cached result for key if younger than ttl seconds, otherwise call fn."""
+        hit = self._meta_cache.get(key)
+        if hit is not None and time.monotonic() - hit[0] < ttl:
+            return hit[1]
+        result = fn()
+        self._meta_cache[key] = (time.monotonic(), result)
+        return result
+
+    def clear_cache(self) -> None:
+        self._meta_cache.clear()
+
     def restart(self) -> str:
         if self.session is not None:
             self.session.endsas()
+        self.clear_cache()
         self._create()
         return "SAS session restarted."
 
@@ -49,20 +80,249 @@ class SASSessionManager:
             self.session = None
         return "SAS session ended."
 
+class SASSessionPool:
+    """Bounded pool of SASSessionManager workers handed out per tool call."""
+    def __init__(self, size: Optional[int] = None, **kwargs: Any):
+        """
+        Initialize `size` SAS sessions with optional kwargs.
+        If size is not given, 'SAS_POOL_SIZE' in environment variables is used.
+        The default is 1, so that WORK datasets and macro variables
+        are shared across tool calls.
+        """
+        if size is None:
+            size = int(os.environ.get('SAS_POOL_SIZE', 1))
+        if size < 1:
+            raise ValueError("SAS session pool size must be at least 1.")
+        self._managers = [SASSessionManager(**kwargs) for _ in range(size)]
+        self._idle: asyncio.Queue[SASSessionManager] = asyncio.Queue()
+        for manager in self._managers:
+            self._idle.put_nowait(manager)
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[SASSessionManager]:
+        """Wait for an idle SAS session and return it to the pool on exit."""
+        manager = await self._idle.get()
+        try:
+            yield manager
+        finally:
+            self._idle.put_nowait(manager)
+
+    async def restart(self) -> str:
+        # drain the pool so that no session is restarted while in use
+        managers = []
+        try:
+            for _ in self._managers:
+                managers.append(await self._idle.get())
+            for manager in managers:
+                await _run_in_session(manager.restart)
+            _cached_html_to_markdown.cache_clear()
+        finally:
+            for manager in managers:
+                self._idle.put_nowait(manager)
+        return "SAS session restarted."
+
+    def clear_cache(self) -> None:
+        # permanent libraries are shared between sessions, so every cache is dropped.
+        # with more than one session, a metadata call that is still running on another
+        # session when this is called can store a result from before the change;
+        # it then stays cached for up to _META_CACHE_TTL seconds.
+        for manager in self._managers:
+            manager.clear_cache()
+
+    def end(self) -> str:
+        for manager in self._managers:
+            manager.end()
+        return "SAS session ended."
+
 @dataclass
 class AppContext:
-    sas: SASSessionManager
+    sas: SASSessionPool
 
 @asynccontextmanager
 async def app_lifespan(server: FastMCP) -> AsyncIterator[AppContext]:
-    """Manage app startup and shutdown lifecycle with SASSessionManager wrapper."""
-    sas = SASSessionManager()
+    """Manage app startup and shutdown lifecycle with SASSessionPool wrapper."""
+    sas = SASSessionPool()
     try:
         yield AppContext(sas=sas)
     finally:
         sas.end()
 
-def _get_content(ll: dict, short: bool = True, max_len: int = 4000) -> str|list[ImageContent]:
+class _SASHTMLToMarkdown(HTMLParser):
+    """
+    Streaming HTML to markdown converter for SAS ODS HTML output.
+
+    SAS output is a flat sequence of titles, headings, tables and preformatted
+    text, so markdown is emitted while parsing without building a document tree.
+    `unsupported` is set for structures this converter does not handle
+    (e.g. nested tables), in which case the caller falls back to markdownify.
+    """
+    _BLOCK_TAGS = {"p", "div", "section", "article", "header", "footer", "caption",
+                   "ul", "ol", "li", "table", "h1", "h2", "h3", "h4", "h5", "h6"}
+    _SKIP_TAGS = {"head", "style", "script", "title"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.unsupported = False
+        # finished markdown, with text outside <pre> already normalized
+        self._parts: list[str] = []
+        self._out: list[str] = []
+        self._skip = 0
+        self._pre = 0
+        self._heading: Optional[int] = None
+        self._heading_buf: list[str] = []
+        self._table_depth = 0
+        self._row: Optional[list[str]] = None
+        self._cell: Optional[list[str]] = None
+        self._colspan = 1
+        self._rows_in_table = 0
+
+    def _flush(self) -> None:
+        text = "".join(self._out)
+        if not self._pre:
+            # drop trailing spaces and squash the blank lines left by block boundaries
+            text = _RE_BLANK_LINES.sub("\n\n", _RE_TRAILING_SPACES.sub("\n", text))
+        self._parts.append(text)
+        self._out = []
+
+    def _write(self, text: str) -> None:
+        if self._cell is not None:
+            self._cell.append(text)
+        elif self._heading is not None:
+            self._heading_buf.append(text)
+        else:
+            self._out.append(text)
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:
+        if tag in self._SKIP_TAGS:
+            self._skip += 1
+        elif self._skip:
+            return
+        elif tag == "table":
+            self._table_depth += 1
+            if self._table_depth > 1:
+                self.unsupported = True
+            self._rows_in_table = 0
+            self._out.append("\n\n")
+        elif tag == "tr":
+            self._row = []
+        elif tag in ("td", "th"):
+            self._cell = []
+            colspan = dict(attrs).get("colspan") or "1"
+            self._colspan = int(colspan) if colspan.isdigit() else 1
+        elif self._cell is not None:
+            # keep table cells on a single line
+            if tag == "br":
+                self._cell.append(" ")
+        elif tag in ("h1", "h2", "h3", "h4", "h5", "h6"):
+            self._out.append("\n\n")
+            self._heading = int(tag[1])
+            self._heading_buf = []
+        elif tag == "pre":
+            self._out.append("\n\n```\n")
+            if not self._pre:
+                self._flush()
+            self._pre += 1
+        elif tag == "br":
+            self._write("\n")
+        elif tag == "li":
+            self._out.append("\n* ")
+        elif tag in self._BLOCK_TAGS:
+            self._out.append("\n\n")
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in self._SKIP_TAGS:
+            self._skip = max(self._skip - 1, 0)
+        elif self._skip:
+            return
+        elif tag == "table":
+            self._table_depth = max(self._table_depth - 1, 0)
+            self._out.append("\n\n")
+        elif tag in ("td", "th") and self._cell is not None:
+            text = " ".join("".join(self._cell).split()).replace("|", "\\|")
+            if self._row is not None:
+                self._row.append(text)
+                self._row.extend([""] * (self._colspan - 1))
+            self._cell = None
+        elif tag == "tr" and self._row is not None:
+            self._out.append("| " + " | ".join(self._row) + " |\n")
+            if self._rows_in_table == 0:
+                self._out.append("| " + " | ".join(["---"] * len(self._row)) + " |\n")
+            self._rows_in_table += 1
+            self._row = None
+        elif self._heading is not None and tag == f"h{self._heading}":
+            text = " ".join("".join(self._heading_buf).split())
+            if text and self._heading <= 2:
+                self._out.append(text + "\n" + ("=" if self._heading == 1 else "-") * len(text))
+            elif text:
+                self._out.append("#" * self._heading + " " + text)
+            self._out.append("\n\n")
+            self._heading = None
+        elif tag == "pre" and self._pre:
+            if self._pre == 1:
+                # preformatted text is kept exactly as SAS wrote it
+                self._flush()
+            self._pre -= 1
+            self._out.append("\n```\n\n")
+        elif tag in self._BLOCK_TAGS and self._cell is None:
+            self._out.append("\n\n")
+
+    def handle_data(self, data: str) -> None:
+        if self._skip:
+            return
+        if self._pre:
+            self._write(data)
+        elif self._cell is not None or self._heading is not None:
+            self._write(data.translate(_MD_ESCAPES))
+        elif data.strip():
+            # collapse insignificant whitespace like a browser would
+            text = " ".join(data.split()).translate(_MD_ESCAPES)
+            if data[0].isspace():
+                text = " " + text
+            if data[-1].isspace():
+                text += " "
+            self._write(text)
+
+    def markdown(self) -> str:
+        self._flush()
+        return "".join(self._parts).strip()
+
+def _html_to_markdown(html: str) -> str:
+    """Convert SAS HTML output to markdown, using markdownify for unsupported structures."""
+    parser = _SASHTMLToMarkdown()
+    parser.feed(html)
+    parser.close()
+    if parser.unsupported:
+        # markdownify pulls in BeautifulSoup, so it is only imported when needed
+        from markdownify import markdownify as md
+        return md(html)
+    return parser.markdown()
+
+def _error_context(log: str, before: int = 6, after: int = 5) -> str:
+    """
+    Return the lines around the first ERROR line of the log.
+
+    The log is sliced at line boundaries found from the first ERROR offset,
+    so no regex search over the whole log is needed. Fewer lines are returned
+    if the error is near the start or end of the log.
+    """
+    first = 0 if log.startswith('ERROR') else log.find('\nERROR') + 1
+    start = first
+    for _ in range(before):
+        if start == 0:
+            break
+        start = log.rfind('\n', 0, start - 1) + 1
+    end = first
+    # the ERROR line itself plus `after` lines
+    for _ in range(after + 1):
+        newline = log.find('\n', end)
+        if newline == -1:
+            end = len(log)
+            break
+        end = newline + 1
+    return log[start:end]
+
+def _get_content(ll: dict, short: bool = True, max_len: int = 4000,
+                 results: Literal["HTML", "TEXT"] = "HTML") -> str|list[ImageContent]:
     """
     Determines if the log or lst should be returned as the
     results for the cell based on parsing the log
@@ -82,6 +342,9 @@ def _get_content(ll: dict, short: bool = True, max_len: int = 4000) -> str|list[
     max_len : int, optional
         Maximum length of LST output to return. If the LST exceeds this length,
         it will be truncated. Default is 4000 characters.
+    results : {"HTML", "TEXT"}, optional
+        Results format passed to saspy submit. HTML output is converted to markdown
+        only when this is "HTML". Default is "HTML".
 
     Returns
     -------
@@ -93,57 +356,80 @@ def _get_content(ll: dict, short: bool = True, max_len: int = 4000) -> str|list[
         
     """
     
-    log = ll["LOG"]
-    if bool(re.search(r'<!DOCTYPE html>', ll["LST"], re.IGNORECASE)):
-        lst = md(ll["LST"])
-    else:
-        lst = ll["LST"]
+    lst = ll["LST"]
+    # SAS HTML output always starts with the DOCTYPE, so only the head is checked.
+    # TEXT listings never embed images or HTML, so neither check is needed for them.
+    if results == "HTML" and '<!doctype html>' in lst[:1024].lower():
+        # images are only embedded in HTML documents and can appear anywhere in them
+        if '<img' in lst:
+            images = _image_content(lst)
+            if images:
+                return images
+        return _log_content(ll["LOG"], _html_lst(lst, short, max_len), short)
+    return _log_content(ll["LOG"], _text_lst(lst, short, max_len), short)
+
+def _image_content(lst: str) -> list[ImageContent]:
+    """Return the images embedded in HTML output."""
+    # each group is a single slice of the LST, so payloads are copied once
+    return [ImageContent(
+                type="image",
+                data=m["b64"],
+                mimeType=m["mime"],
+                annotations={
+                    "title": m["alt"]
+                }
+            ) for m in _RE_IMG.finditer(lst)]
+
+# the same output is often converted again when the same code is rerun.
+# only the bounded short=True input is cached, so entries stay small.
+@lru_cache(maxsize=32)
+def _cached_html_to_markdown(html: str) -> str:
+    return _html_to_markdown(html)
 
+def _html_lst(lst: str, short: bool, max_len: int) -> str:
+    """Convert HTML output to markdown, truncated to max_len if short."""
+    raw_lst = lst
+    if short:
+        # conversion never grows the output, so a bounded slice is enough when truncating.
+        # the bound starts at <body> since the style sheet in <head> can be large.
+        body_start = max(lst.find('<body'), 0)
+        raw_lst = lst[:body_start + max_len*8]
+        if len(raw_lst) < len(lst):
+            # cut outside a tag and before an unfinished table row,
+            # so that the parser never emits a partial tag or row as text
+            tag_start = raw_lst.rfind('<')
+            if tag_start > raw_lst.rfind('>'):
+                raw_lst = raw_lst[:tag_start]
+            row_start = raw_lst.rfind('<tr')
+            if row_start > raw_lst.rfind('</tr>'):
+                raw_lst = raw_lst[:row_start]
+    md_lst = _cached_html_to_markdown(raw_lst) if short else _html_to_markdown(raw_lst)
+    if short and (len(md_lst) > max_len or len(raw_lst) < len(lst)):
+        md_lst = md_lst[:max_len-30] + "\n\n[Output is truncated.]"
+    return md_lst
+
+def _text_lst(lst: str, short: bool, max_len: int) -> str:
+    """Return text output, truncated to max_len if short."""
     if len(lst) > max_len and short:
         lst = lst[:max_len-30] + "\n\n[Output is truncated.]"
+    return lst
 
+def _log_content(log: str, lst: str, short: bool) -> str:
+    """Combine the processed output with the log based on the errors in the log."""
     # Check Error
-    lines = re.split(r'[\n]\s*', log)
-    error_count = 0
-    msg_list = []
-    error_line_list = []
-    for index, line in enumerate(lines):
-        if line.startswith('ERROR'):
-            error_count += 1
-            msg_list.append(line)
-            error_line_list.append(index)
-
-    img_tags = re.findall(r'<img[^>]*>', ll["LST"])
-    # return encoded image
-    if img_tags:
-        images = []
-        for img_tag in img_tags:
-            m = re.search(r'alt="([^"]*)"\s*src="data:([^;]+);base64,([^"]+)"', img_tag)
-            alt_txt =  m.group(1)
-            mime_type = m.group(2)
-            base64_data = m.group(3)
-            images.append(ImageContent(
-                type="image",
-                data=base64_data,
-                mimeType=mime_type,
-                annotations={
-                    "title": alt_txt
-                }
-            ))
-        return images
+    # most logs are clean, so skip the line scan unless ERROR appears at all
+    if 'ERROR' in log:
+        error_count = log.count('\nERROR') + log.startswith('ERROR')
+    else:
+        error_count = 0
 
     # no error and LST output
     if error_count == 0 and len(lst) > 0:
         return lst
-    elif error_count > 0 and len(lst) > 0 and not img_tags:  # errors and LST
+    elif error_count > 0 and len(lst) > 0:  # errors and LST
         # filter log to lines around first error
-        # by default get 5 lines on each side of the first Error message.
-        # to change that modify the values in {} below
-        regex_around_error = r"(.*)(.*\n){6}^ERROR(.*\n){6}"
-        # Extract the first match +/- 5 lines
-        e_log = re.search(regex_around_error, log, re.MULTILINE).group()
-        assert error_count == len(
-            error_line_list), "Error count and count of line number don't match"
+        # by default get 6 lines before and 5 lines after the first Error message.
+        e_log = _error_context(log)
         return e_log + lst
     # for everything else return the log
     if not short:
@@ -151,6 +437,27 @@ def _get_content(ll: dict, short: bool = True, max_len: int = 4000) -> str|list[
     else:
         return "Code executed with No Errors."
 
+async def _run_in_session(fn: Callable[..., Any], *args: Any, ctx: Optional[Context] = None, **kwargs: Any) -> Any:
+    """
+    Run a blocking saspy call in a worker thread and wait for it on every exit path.
+
+    If ctx is given, elapsed seconds are reported as progress until the call finishes.
+    saspy returns the LOG and LST only when a submit completes, so progress
+    notifications are what lets the client see that a long job is still running.
+    """
+    task = asyncio.create_task(asyncio.to_thread(fn, *args, **kwargs))
+    start = time.monotonic()
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=_PROGRESS_INTERVAL if ctx else None)
+            if done:
+                return task.result()
+            await ctx.report_progress(progress=time.monotonic() - start)
+    except BaseException:
+        # the session must not go back to the pool while SAS is still running
+        await asyncio.wait({task})
+        raise
+
 mcp = FastMCP(name="basic-mcp-sas-server",
               instructions= "MCP server that executes SAS code, provides information related to SAS with saspy.", 
               lifespan=app_lifespan
@@ -159,7 +466,7 @@ mcp = FastMCP(name="basic-mcp-sas-server",
 @mcp.tool(description="Submit SAS code for execution. Use this if no other tool is appropriate.",
           tags={"sas"}
           )
-def submit(ctx: Context, code: Annotated[str, "SAS code to submit. Only SAS code is allowed."], 
+async def submit(ctx: Context, code: Annotated[str, "SAS code to submit. Only SAS code is allowed."], 
            results: Annotated[Literal["HTML", "TEXT"], Field(description="Specify `TEXT` only if there is a problem with the default output or if explicitly instructed.", default="HTML")],
            short: Annotated[bool, Field(description="KEEP this set to True. Only if explicitly instructed to output without omitting, set to False.", default=True)]
            ) -> str | ImageContent:
@@ -168,77 +475,88 @@ def submit(ctx: Context, code: Annotated[str, "SAS code to submit. Only SAS code
     Note: While this tool is convenient, it executes code as-is, which means problematic or unsafe code could be run. 
           It is recommended to configure more specific tools and consider disabling this tool for improved safety.
     """
-    sas = ctx.request_context.lifespan_context.sas.session
-    ll = sas.submit(code, results=results)
-    return _get_content(ll, short)
+    sas_pool = ctx.request_context.lifespan_context.sas
+    # arbitrary code can assign librefs or create and drop tables,
+    # and it has run even if the submit raised or was cancelled
+    try:
+        async with sas_pool.acquire() as sas_sm:
+            sas_pool.clear_cache()
+            ll = await _run_in_session(sas_sm.session.submit, code, ctx=ctx, results=results)
+    finally:
+        sas_pool.clear_cache()
+    # a full HTML parse of large output would otherwise block the event loop
+    return await asyncio.to_thread(_get_content, ll, short, results=results)
 
 @mcp.tool(tags={"sas"})
-def restart(ctx: Context) -> str:
+async def restart(ctx: Context) -> str:
     """Restart SAS session. Only execute if explicitly instructed."""
-    sas_sm = ctx.request_context.lifespan_context.sas
-    return sas_sm.restart()
+    sas_pool = ctx.request_context.lifespan_context.sas
+    return await sas_pool.restart()
 
 @mcp.tool(tags={"sas", "meta"})
-def assigned_librefs(ctx: Context) -> list:
+async def assigned_librefs(ctx: Context) -> list:
     """List SAS assigned libraries."""
-    sas = ctx.request_context.lifespan_context.sas.session
-    result = sas.assigned_librefs() 
+    async with ctx.request_context.lifespan_context.sas.acquire() as sas_sm:
+        result = await _run_in_session(sas_sm.cached, ("assigned_librefs",),
+                                       sas_sm.session.assigned_librefs)
     return result
 
 @mcp.tool(tags={"sas", "meta"})
-def list_tables(ctx: Context, libref: Annotated[str, "SAS libname."]) -> list:
+async def list_tables(ctx: Context, libref: Annotated[str, "SAS libname."]) -> list:
     """List SAS tables in a library."""
-    sas = ctx.request_context.lifespan_context.sas.session
-    result = sas.list_tables(libref=libref)
+    async with ctx.request_context.lifespan_context.sas.acquire() as sas_sm:
+        result = await _run_in_session(sas_sm.cached, ("list_tables", libref.upper()),
+                                       partial(sas_sm.session.list_tables, libref=libref))
     return result
 
 @mcp.tool(tags={"sas", "meata"})
-def columnInfo_t(ctx: Context, table: Annotated[str, Field(description="SAS table name.")],
+async def columnInfo_t(ctx: Context, table: Annotated[str, Field(description="SAS table name.")],
                libref: Annotated[str, Field(description="SAS libname.", default="WORK")]) -> dict:
     """Get column information of a SAS dataset."""
-    sas = ctx.request_context.lifespan_context.sas.session
-    ds = sas.sasdata(table, libref, results="TEXT")
-    return ds.columnInfo()
+    async with ctx.request_context.lifespan_context.sas.acquire() as sas_sm:
+        return await _run_in_session(sas_sm.cached, ("columnInfo", libref.upper(), table.upper()),
+                                     lambda: sas_sm.session.sasdata(table, libref, results="TEXT").columnInfo())
 
 @mcp.tool(tags={"sas", "data"})
-def head(ctx: Context,  table: Annotated[str, Field(description="SAS table name.")], 
+async def head(ctx: Context,  table: Annotated[str, Field(description="SAS table name.")], 
          libref: Annotated[str, Field(description="SAS libname.", default="WORK")],
          obs: Annotated[int, Field(description="Number of rows to return.", ge=0, default=5)] ) -> str:
     """Get the first few rows of a SAS dataset."""
-    sas = ctx.request_context.lifespan_context.sas.session
-    ds = sas.sasdata(table, libref, results="TEXT")
-    return ds.head(obs=obs)
+    async with ctx.request_context.lifespan_context.sas.acquire() as sas_sm:
+        ds = await _run_in_session(sas_sm.session.sasdata, table, libref, results="TEXT")
+        return await _run_in_session(ds.head, obs=obs)
 
 @mcp.tool(tags={"sas", "data"})
-def print(ctx: Context,  table: Annotated[str, Field(description="SAS table name.")], 
+async def print(ctx: Context,  table: Annotated[str, Field(description="SAS table name.")], 
          libref: Annotated[str, Field(description="SAS libname.", default="WORK")],
          var: Annotated[str, Field(description="Variable to print.", default="_ALL_")]
          ) -> str:
     """Print all SAS dataset obs with variable labels."""
-    sas = ctx.request_context.lifespan_context.sas.session
-    ll = sas.submit(f"proc print data={libref}.{table} label ; var {var}; run;")
-    return _get_content(ll, short=False)
+    async with ctx.request_context.lifespan_context.sas.acquire() as sas_sm:
+        ll = await _run_in_session(sas_sm.session.submit, f"proc print data={libref}.{table} label ; var {var}; run;",
+                                   ctx=ctx)
+    return await asyncio.to_thread(_get_content, ll, short=False, results="HTML")
 
 @mcp.resource("file://{path}",
               annotations={ "readOnlyHint": True,}
               ,tags={"sas", "file"}
               )
-def cat(ctx: Context, path: Annotated[Path, "File path to read."]) -> str:
+async def cat(ctx: Context, path: Annotated[Path, "File path to read."]) -> str:
     """Get file contents. Like `cat` in Unix."""
-    sas = ctx.request_context.lifespan_context.sas.session
-    result = sas.cat(path)
+    async with ctx.request_context.lifespan_context.sas.acquire() as sas_sm:
+        result = await _run_in_session(sas_sm.session.cat, path)
     return result
 
 @mcp.resource("sasdata://{libref}/{table}/columnInfo",
               annotations={"readOnlyHint": True,},
               tags={"sas", "meta"}
               )
-def columnInfo_r(ctx: Context, table: Annotated[str, Field(description="SAS table name.")],
+async def columnInfo_r(ctx: Context, table: Annotated[str, Field(description="SAS table name.")],
                libref: Annotated[str, Field(description="SAS libname.", default="WORK")]) -> dict:
     """Get column information of a SAS dataset."""
-    sas = ctx.request_context.lifespan_context.sas.session
-    ds = sas.sasdata(table, libref, results="TEXT")
-    return ds.columnInfo()
+    async with ctx.request_context.lifespan_context.sas.acquire() as sas_sm:
+        return await _run_in_session(sas_sm.cached, ("columnInfo", libref.upper(), table.upper()),
+                                     lambda: sas_sm.session.sasdata(table, libref, results="TEXT").columnInfo())
 
 if __name__ == "__main__":
     mcp.run(transport="stdio")